@@ -2,15 +2,27 @@ import streamlit as st
 import joblib
 import pandas as pd
 import numpy as np
-import os
+import io
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass, asdict, astuple
+from typing import Final
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Age bins used for the age_group feature
+AGE_BINS = [0, 30, 40, 50, 60, 100]
+AGE_LABELS = ["18-30", "31-40", "41-50", "51-60", "60+"]
 
 def add_engineered_features(X):
     X = X.copy()
 
     X["age_group"] = pd.cut(
         X["age"],
-        bins=[0, 30, 40, 50, 60, 100],
-        labels=["18-30", "31-40", "41-50", "51-60", "60+"]
+        bins=AGE_BINS,
+        labels=AGE_LABELS
     )
 
     X["was_previously_contacted"] = (X["previous"] > 0).astype(int)
@@ -28,7 +40,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS: Final = """
     <style>
     .main {padding: 2rem;}
     .stButton>button {
@@ -41,190 +53,456 @@ st.markdown("""
     }
     .stButton>button:hover {background-color: #27ae60;}
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Constants
 MODEL_PATH = 'final_bank_marketing_model.joblib'
 
+# Probability cut-offs for the MEDIUM and HIGH priority recommendations
+PRIORITY_THRESHOLDS: Final = (0.4, 0.7)
+PRIORITY_LABELS: Final = ('LOW', 'MEDIUM', 'HIGH')
+
+# Options offered by the sidebar selectboxes (also used as the categorical dtypes of the input).
+# Tuples of literals are compile-time constants, so reruns do not rebuild them
+CATEGORIES: Final = {
+    'job': (
+        'admin.', 'blue-collar', 'entrepreneur', 'housemaid', 
+        'management', 'retired', 'self-employed', 'services', 
+        'student', 'technician', 'unemployed', 'unknown'
+    ),
+    'marital': ('married', 'single', 'divorced', 'unknown'),
+    'education': (
+        'basic.4y', 'basic.6y', 'basic.9y', 'high.school', 
+        'illiterate', 'professional.course', 'university.degree', 'unknown'
+    ),
+    'default': ('no', 'yes', 'unknown'),
+    'housing': ('no', 'yes', 'unknown'),
+    'loan': ('no', 'yes', 'unknown'),
+    'contact': ('cellular', 'telephone'),
+    'month': (
+        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
+        'jul', 'aug', 'sep', 'oct', 'nov', 'dec'
+    ),
+    'day_of_week': ('mon', 'tue', 'wed', 'thu', 'fri'),
+    'poutcome': ('nonexistent', 'failure', 'success'),
+}
+
+# Input columns, in training order
+INPUT_COLUMNS: Final = (
+    'age', 'job', 'marital', 'education', 'default', 'housing', 'loan',
+    'contact', 'month', 'day_of_week', 'campaign', 'previous', 'poutcome',
+    'emp.var.rate', 'cons.price.idx', 'cons.conf.idx', 'euribor3m', 'nr.employed'
+)
+
+@st.cache_resource
+def input_dtypes():
+    """dtype of every input column (built once per process, not on every rerun)"""
+    # The economic indicators stay float64 so the values reaching the scaler
+    # are exactly what the user entered
+    narrow = {'age': 'int16', 'campaign': 'int16', 'previous': 'int8'}
+    return {
+        col: pd.CategoricalDtype(CATEGORIES[col]) if col in CATEGORIES else narrow.get(col, 'float64')
+        for col in INPUT_COLUMNS
+    }
+
+@dataclass(slots=True)
+class ClientInputs:
+    """Raw values collected from the sidebar widgets"""
+    age: int
+    job: str
+    marital: str
+    education: str
+    default: str
+    housing: str
+    loan: str
+    contact: str
+    month: str
+    day_of_week: str
+    campaign: int
+    previous: int
+    poutcome: str
+    emp_var_rate: float
+    cons_price_idx: float
+    cons_conf_idx: float
+    euribor3m: float
+    nr_employed: float
+
+# ClientInputs fields whose model column name differs (all other fields match their column)
+FIELD_COLUMNS: Final = {
+    'emp_var_rate': 'emp.var.rate',
+    'cons_price_idx': 'cons.price.idx',
+    'cons_conf_idx': 'cons.conf.idx',
+    'nr_employed': 'nr.employed',
+}
+
+# Sidebar default values (the widgets read them from here), also used to warm up the model after loading
+DEFAULT_INPUTS: Final = ClientInputs(
+    age=35, job='admin.', marital='married', education='basic.4y',
+    default='no', housing='no', loan='no',
+    contact='cellular', month='jan', day_of_week='mon',
+    campaign=2, previous=0, poutcome='nonexistent',
+    emp_var_rate=1.1, cons_price_idx=93.994, cons_conf_idx=-36.4,
+    euribor3m=4.857, nr_employed=5191.0
+)
+
 @st.cache_resource
 def load_model():
     """Load the trained pipeline"""
-    if not os.path.exists(MODEL_PATH):
+    try:
+        model = joblib.load(MODEL_PATH)
+    except FileNotFoundError:
         st.error(f" Model file not found: {MODEL_PATH}")
         st.info("Please run the Jupyter notebook first to train and save the model.")
         return None
-    
-    try:
-        model = joblib.load(MODEL_PATH)
-        return model
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None
 
+    # Warm up with one prediction so the first click does not pay for lazy initialisation
+    try:
+        predict_subscription(model, DEFAULT_INPUTS)
+    except Exception:
+        logger.warning("Model warm-up prediction failed", exc_info=True)
+
+    return model
+
+@st.cache_resource
+def compile_model(_model):
+    """Fold feature selection and the logistic regression into one weight vector"""
+    # The model is loaded once per process, so the (unhashed) pipeline needs no cache key
+    selector = _model.named_steps.get('feature_selection')
+    classifier = _model.named_steps.get('classifier')
+    if selector is None or not isinstance(classifier, LogisticRegression):
+        return None
+
+    # The weights only line up with model[:-2]'s output if the selector feeds the classifier directly
+    if len(_model.steps) < 3 or _model.steps[-2][1] is not selector or _model.steps[-1][1] is not classifier:
+        return None
+
+    # predict_proba is sigmoid(coef @ x + intercept) only for a binary one-vs-rest model
+    # (a binary multinomial fit gives sigmoid(2 * score))
+    one_vs_rest = (
+        classifier.solver == 'liblinear'
+        or getattr(classifier, 'multi_class', 'auto') in ('auto', 'ovr', 'deprecated')
+    )
+    if not one_vs_rest or list(classifier.classes_) != [0, 1]:
+        return None
+
+    support = selector.get_support()
+    weights = np.zeros(support.shape[0])
+    weights[support] = classifier.coef_[0]
+    return _model[:-2], weights, classifier.intercept_[0]
+
+@st.cache_resource
+def compile_scorer(_model):
+    """Partially evaluate preprocessing + the folded linear model into per-input terms"""
+    # score_client replays add_engineered_features by hand, so only the exact trained layout qualifies
+    step_names = [name for name, _ in _model.steps]
+    if step_names != ['feature_engineering', 'preprocessor', 'feature_selection', 'classifier']:
+        return None
+    if getattr(_model.named_steps['feature_engineering'], 'func', None) is not add_engineered_features:
+        return None
+
+    compiled = compile_model(_model)
+    preprocessor = _model.named_steps['preprocessor']
+    if compiled is None:
+        return None
+
+    _, weights, intercept = compiled
+    linear_terms = []    # (column, coefficient on the raw value)
+    category_terms = []  # (column, {category: contribution to the score})
+    start = 0
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop':
+            continue
+        if isinstance(transformer, StandardScaler) and transformer.with_mean and transformer.with_std:
+            # w * (x - mean) / scale == (w / scale) * x - w * mean / scale
+            coefs = weights[start:start + len(columns)] / transformer.scale_
+            intercept -= coefs @ transformer.mean_
+            linear_terms.extend(zip(columns, coefs.tolist()))
+            start += len(columns)
+        elif (
+            isinstance(transformer, OneHotEncoder)
+            and transformer.drop is None
+            and transformer.handle_unknown == 'ignore'
+            and not any(c is not None for c in getattr(transformer, 'infrequent_categories_', ()))
+        ):
+            # A one-hot column only adds its weight, and with handle_unknown='ignore' (and no
+            # infrequent grouping) values the encoder never saw add nothing
+            for col, categories in zip(columns, transformer.categories_):
+                contributions = weights[start:start + len(categories)].tolist()
+                category_terms.append((col, dict(zip(categories, contributions))))
+                start += len(categories)
+        elif isinstance(transformer, FunctionTransformer) and transformer.func is None:
+            linear_terms.extend(zip(columns, weights[start:start + len(columns)].tolist()))
+            start += len(columns)
+        else:
+            return None
+
+    if start != len(weights):
+        return None
+
+    return float(intercept), linear_terms, category_terms
+
+def engineer_client_features(inputs):
+    """Scalar version of add_engineered_features for a single client"""
+    values = {FIELD_COLUMNS.get(field, field): value for field, value in asdict(inputs).items()}
+
+    group = bisect_left(AGE_BINS, values['age'])
+    values['age_group'] = AGE_LABELS[group - 1] if 0 < group < len(AGE_BINS) else None
+    values['was_previously_contacted'] = int(values['previous'] > 0)
+    values['campaign_successful'] = int(values['campaign'] < 5)
+    values['poutcome_success'] = int(values['poutcome'] == 'success')
+    return values
+
+def score_client(scorer, inputs):
+    """Return the model score (logit) for one client as a sum of precomputed terms"""
+    intercept, linear_terms, category_terms = scorer
+    values = engineer_client_features(inputs)
+
+    score = intercept
+    for col, coef in linear_terms:
+        score += coef * values[col]
+    for col, contributions in category_terms:
+        score += contributions.get(values[col], 0.0)
+    return score
+
+def predict_probabilities(model, X):
+    """Return the subscription probability for every row of X"""
+    compiled = compile_model(model)
+
+    if compiled is not None:
+        # Feature engineering + preprocessing, then the folded linear model
+        preprocess, weights, intercept = compiled
+        scores = preprocess.transform(X) @ weights + intercept
+
+        # The folded model skips the classifier's own input validation, so reject
+        # missing values the same way LogisticRegression.predict_proba would
+        if not np.isfinite(scores).all():
+            raise ValueError("Input X contains NaN.")
+
+        return 1.0 / (1.0 + np.exp(-scores))
+
+    # Fall back to the pipeline's own classifier
+    features = model[:-1].transform(X)
+    classifier = model[-1]
+    positive = list(classifier.classes_).index(1)
+    return classifier.predict_proba(features)[:, positive]
+
+@st.cache_data
+def predict_subscription(_model, inputs):
+    """Return (prediction, probability) for one client (cached on the input values)"""
+    scorer = compile_scorer(_model)
+
+    if scorer is not None:
+        # Closed-form score from the widget values, no pandas/sklearn involved
+        probability = 1.0 / (1.0 + np.exp(-score_client(scorer, inputs)))
+    else:
+        probability = predict_probabilities(_model, _build_input_df(**asdict(inputs)))[0]
+
+    # The label is derived from the probability (same as predict for a binary classifier)
+    return int(probability > 0.5), float(probability)
+
+@st.cache_data(show_spinner="Scoring clients...", max_entries=8, ttl=3600)
+def score_batch(_model, file_id, _data):
+    """Score an uploaded client CSV, returning the results and their CSV export
+
+    Cached on the upload's file_id, so sidebar reruns do not re-read or re-score the file.
+    Every upload gets a new file_id, so only the latest few are kept, for an hour at most.
+    """
+    batch_df = pd.read_csv(io.BytesIO(_data), sep=None, engine='python')
+
+    features = batch_df[list(INPUT_COLUMNS)]
+
+    # A missing category is one-hot encoded as all zeros (handle_unknown='ignore'), but a missing
+    # number breaks the scaler; those rows are left blank instead of failing the batch
+    numeric_columns = [col for col in INPUT_COLUMNS if col not in CATEGORIES]
+    scorable = features[numeric_columns].notna().all(axis=1).to_numpy()
+    probabilities = np.full(len(batch_df), np.nan)
+    if scorable.any():
+        # One vectorized pass over every scorable row
+        probabilities[scorable] = predict_probabilities(_model, features[scorable])
+    unscored = ~np.isfinite(probabilities)
+
+    results = batch_df.assign(
+        probability=probabilities,
+        prediction=pd.Series((probabilities > 0.5).astype(int), index=batch_df.index, dtype='Int8').mask(unscored),
+        # Vectorized version of the single-client recommendation tiers (NaN would land in the top bin)
+        priority=pd.Series(
+            np.array(PRIORITY_LABELS)[np.digitize(probabilities, PRIORITY_THRESHOLDS, right=True)],
+            index=batch_df.index
+        ).mask(unscored)
+    )
+    return results, results.to_csv(index=False)
+
+@st.cache_data
+def _build_input_df(age, job, marital, education, default, housing, loan,
+                    contact, month, day_of_week, campaign, previous, poutcome,
+                    emp_var_rate, cons_price_idx, cons_conf_idx, euribor3m, nr_employed):
+    """Build the one-row model input (cached on the widget values)"""
+    values = (
+        age, job, marital, education, default, housing, loan,
+        contact, month, day_of_week, campaign, previous, poutcome,
+        emp_var_rate, cons_price_idx, cons_conf_idx, euribor3m, nr_employed
+    )
+
+    # Create DataFrame directly from typed one-element columns
+    input_df = pd.DataFrame({
+        col: pd.array([value], dtype=dtype)
+        for (col, dtype), value in zip(input_dtypes().items(), values)
+    }, copy=False)
+    
+    # Engineered features (age_group, was_previously_contacted, campaign_successful, poutcome_success)
+    # are added by the pipeline itself via add_engineered_features, so they are not set here
+    return input_df
+
 def get_user_input():
     """Collect user input from sidebar"""
     st.sidebar.header(" Client Information")
     
     # Personal Information
     st.sidebar.subheader("Personal Details")
-    age = st.sidebar.slider("Age", 18, 95, 35)
+    age = st.sidebar.slider("Age", 18, 95, DEFAULT_INPUTS.age)
     
-    job = st.sidebar.selectbox("Job", [
-        'admin.', 'blue-collar', 'entrepreneur', 'housemaid', 
-        'management', 'retired', 'self-employed', 'services', 
-        'student', 'technician', 'unemployed', 'unknown'
-    ])
+    job = st.sidebar.selectbox("Job", CATEGORIES['job'], index=CATEGORIES['job'].index(DEFAULT_INPUTS.job))
     
-    marital = st.sidebar.selectbox("Marital Status", 
-        ['married', 'single', 'divorced', 'unknown'])
+    marital = st.sidebar.selectbox("Marital Status", CATEGORIES['marital'], index=CATEGORIES['marital'].index(DEFAULT_INPUTS.marital))
     
-    education = st.sidebar.selectbox("Education", [
-        'basic.4y', 'basic.6y', 'basic.9y', 'high.school', 
-        'illiterate', 'professional.course', 'university.degree', 'unknown'
-    ])
+    education = st.sidebar.selectbox("Education", CATEGORIES['education'], index=CATEGORIES['education'].index(DEFAULT_INPUTS.education))
     
     # Financial Information
     st.sidebar.subheader("Financial Status")
-    default = st.sidebar.selectbox("Credit in Default?", ['no', 'yes', 'unknown'])
-    housing = st.sidebar.selectbox("Housing Loan?", ['no', 'yes', 'unknown'])
-    loan = st.sidebar.selectbox("Personal Loan?", ['no', 'yes', 'unknown'])
+    default = st.sidebar.selectbox("Credit in Default?", CATEGORIES['default'], index=CATEGORIES['default'].index(DEFAULT_INPUTS.default))
+    housing = st.sidebar.selectbox("Housing Loan?", CATEGORIES['housing'], index=CATEGORIES['housing'].index(DEFAULT_INPUTS.housing))
+    loan = st.sidebar.selectbox("Personal Loan?", CATEGORIES['loan'], index=CATEGORIES['loan'].index(DEFAULT_INPUTS.loan))
     
     # Campaign Information
     st.sidebar.subheader("Campaign Details")
-    contact = st.sidebar.selectbox("Contact Type", ['cellular', 'telephone'])
-    month = st.sidebar.selectbox("Last Contact Month", [
-        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-        'jul', 'aug', 'sep', 'oct', 'nov', 'dec'
-    ])
-    day_of_week = st.sidebar.selectbox("Last Contact Day", 
-        ['mon', 'tue', 'wed', 'thu', 'fri'])
+    contact = st.sidebar.selectbox("Contact Type", CATEGORIES['contact'], index=CATEGORIES['contact'].index(DEFAULT_INPUTS.contact))
+    month = st.sidebar.selectbox("Last Contact Month", CATEGORIES['month'], index=CATEGORIES['month'].index(DEFAULT_INPUTS.month))
+    day_of_week = st.sidebar.selectbox("Last Contact Day", CATEGORIES['day_of_week'], index=CATEGORIES['day_of_week'].index(DEFAULT_INPUTS.day_of_week))
     
-    campaign = st.sidebar.number_input("Contacts in Current Campaign", 1, 50, 2)
-    #pdays = st.sidebar.number_input("Days Since Last Contact (999 if never)", 0, 999, 999)
-    previous = st.sidebar.number_input("Previous Contacts", 0, 10, 0)
-    poutcome = st.sidebar.selectbox("Previous Campaign Outcome", 
-        ['nonexistent', 'failure', 'success'])
+    campaign = st.sidebar.number_input("Contacts in Current Campaign", 1, 50, DEFAULT_INPUTS.campaign)
+    previous = st.sidebar.number_input("Previous Contacts", 0, 10, DEFAULT_INPUTS.previous)
+    poutcome = st.sidebar.selectbox("Previous Campaign Outcome", CATEGORIES['poutcome'], index=CATEGORIES['poutcome'].index(DEFAULT_INPUTS.poutcome))
     
     # Economic Indicators
     st.sidebar.subheader("Economic Indicators")
-    emp_var_rate = st.sidebar.number_input("Employment Variation Rate", -5.0, 5.0, 1.1, 0.1)
-    cons_price_idx = st.sidebar.number_input("Consumer Price Index", 90.0, 100.0, 93.994, 0.001)
-    cons_conf_idx = st.sidebar.number_input("Consumer Confidence Index", -60.0, 0.0, -36.4, 0.1)
-    euribor3m = st.sidebar.number_input("Euribor 3 Month Rate", 0.0, 10.0, 4.857, 0.001)
-    nr_employed = st.sidebar.number_input("Number of Employees", 4900.0, 5300.0, 5191.0, 0.1)
-    
-    # Create feature dictionary
-    data = {
-        'age': age,
-        'job': job,
-        'marital': marital,
-        'education': education,
-        'default': default,
-        'housing': housing,
-        'loan': loan,
-        'contact': contact,
-        'month': month,
-        'day_of_week': day_of_week,
-        'campaign': campaign,
-        #'pdays': pdays,
-        'previous': previous,
-        'poutcome': poutcome,
-        'emp.var.rate': emp_var_rate,
-        'cons.price.idx': cons_price_idx,
-        'cons.conf.idx': cons_conf_idx,
-        'euribor3m': euribor3m,
-        'nr.employed': nr_employed
-    }
-    
-    # Create DataFrame
-    input_df = pd.DataFrame([data])
+    emp_var_rate = st.sidebar.number_input("Employment Variation Rate", -5.0, 5.0, DEFAULT_INPUTS.emp_var_rate, 0.1)
+    cons_price_idx = st.sidebar.number_input("Consumer Price Index", 90.0, 100.0, DEFAULT_INPUTS.cons_price_idx, 0.001)
+    cons_conf_idx = st.sidebar.number_input("Consumer Confidence Index", -60.0, 0.0, DEFAULT_INPUTS.cons_conf_idx, 0.1)
+    euribor3m = st.sidebar.number_input("Euribor 3 Month Rate", 0.0, 10.0, DEFAULT_INPUTS.euribor3m, 0.001)
+    nr_employed = st.sidebar.number_input("Number of Employees", 4900.0, 5300.0, DEFAULT_INPUTS.nr_employed, 0.1)
     
-    # Engineer features (MUST match the 3 features used in training: was_previously_contacted, campaign_successful, poutcome_success)
-    #input_df['was_previously_contacted'] = (input_df['pdays'] != 999).astype(int)
- 
-    #input_df['campaign_successful'] = input_df['campaign'].apply(lambda x: 1 if x < 5 else 0) 
-    
-    #input_df['poutcome_success'] = (input_df['poutcome'] == 'success').astype(int)
-  
-    return input_df
+    inputs = ClientInputs(
+        age=age, job=job, marital=marital, education=education,
+        default=default, housing=housing, loan=loan,
+        contact=contact, month=month, day_of_week=day_of_week,
+        campaign=campaign, previous=previous, poutcome=poutcome,
+        emp_var_rate=emp_var_rate, cons_price_idx=cons_price_idx, cons_conf_idx=cons_conf_idx,
+        euribor3m=euribor3m, nr_employed=nr_employed
+    )
+    return inputs
 
 def main():
     # Header
     st.title("🏦 Bank Term Deposit Subscription Predictor")
     st.markdown("---")
     
-    # Load model
-    model = load_model()
-    
-    if model is None:
-        st.stop()
-    
     # Get user input
-    input_df = get_user_input()
+    inputs = get_user_input()
     
-    # Main content area
-    col1, col2 = st.columns([1, 1])
+    single_tab, batch_tab = st.tabs(["🔮 Single Client", "📁 Batch Scoring"])
+
+    with single_tab:
+        # Main content area
+        col1, col2 = st.columns([1, 1])
     
-    with col1:
-        st.subheader("📊 Client Profile Summary")
+        with col1:
+            st.subheader("📊 Client Profile Summary")
         
-        # Displaying selected information
-        st.markdown(f"""
-        **Personal Information:**
-        - Age: {input_df['age'].values[0]} years
-        - Job: {input_df['job'].values[0]}
-        - Education: {input_df['education'].values[0]}
-        - Marital Status: {input_df['marital'].values[0]}
+            # Displaying selected information
+            st.markdown(f"""
+            **Personal Information:**
+            - Age: {inputs.age} years
+            - Job: {inputs.job}
+            - Education: {inputs.education}
+            - Marital Status: {inputs.marital}
         
-        **Financial Status:**
-        - Housing Loan: {input_df['housing'].values[0]}
-        - Personal Loan: {input_df['loan'].values[0]}
-        - Credit Default: {input_df['default'].values[0]}
+            **Financial Status:**
+            - Housing Loan: {inputs.housing}
+            - Personal Loan: {inputs.loan}
+            - Credit Default: {inputs.default}
         
-        **Campaign History:**
-        - Contacts this campaign: {input_df['campaign'].values[0]}
-        - Previous contacts: {input_df['previous'].values[0]}
-        - Last outcome: {input_df['poutcome'].values[0]}
-        """)
+            **Campaign History:**
+            - Contacts this campaign: {inputs.campaign}
+            - Previous contacts: {inputs.previous}
+            - Last outcome: {inputs.poutcome}
+            """)
     
 
 
 
-    with col2:
-        st.subheader("🎯 Prediction")
+        with col2:
+            st.subheader("🎯 Prediction")
         
-        if st.button("🔮 Predict Subscription"):
-            try:
-                with st.spinner("Analyzing client profile..."):
-                    # Make prediction
-                    prediction = model.predict(input_df)[0]
-                    probability = model.predict_proba(input_df)[0, 1]
+            if st.button("🔮 Predict Subscription"):
+                # Usually already loaded at the end of the first render (cached)
+                model = load_model()
+
+                if model is None:
+                    st.stop()
+
+                try:
+                    with st.spinner("Analyzing client profile..."):
+                        # Make prediction
+                        prediction, probability = predict_subscription(model, inputs)
+
+                    # Keep the result so it survives reruns triggered by other widgets
+                    st.session_state['last_pred'] = (astuple(inputs), prediction, probability)
+
+                    # Only celebrate a result that differs from the one already on screen
+                    render_key = (prediction, round(probability, 3))
+                    if prediction == 1 and st.session_state.get('last_render_key') != render_key:
+                        st.balloons()
+                    st.session_state['last_render_key'] = render_key
                 
+                except Exception as e:
+                    st.session_state.pop('last_pred', None)
+                    st.error(f"Prediction error: {e}")
+                    st.info("Please check that all required features are provided.")
+
+            if 'last_pred' in st.session_state:
+                predicted_inputs, prediction, probability = st.session_state['last_pred']
+
+                if predicted_inputs != astuple(inputs):
+                    st.caption("Client details changed since this prediction. Click Predict to update it.")
+
                 # Display results
                 if prediction == 1:
                     st.success("### ✅ LIKELY TO SUBSCRIBE")
-                    st.balloons()
                 else:
                     st.error("### ❌ UNLIKELY TO SUBSCRIBE")
-                
+            
                 # Probability gauge
                 st.metric("Subscription Probability", f"{probability:.1%}")
-                
+            
                 # Progress bar
                 st.progress(probability)
-                
+            
                 # Recommendation
                 st.markdown("---")
                 st.subheader("💡 Recommendation")
-                
-                if probability > 0.7:
+            
+                if probability > PRIORITY_THRESHOLDS[1]:
                     st.success("""
                     **HIGH PRIORITY CLIENT**
                     - Immediate follow-up recommended
                     - Offer premium term deposit rates
                     - Assign to senior sales representative
                     """)
-                elif probability > 0.4:
+                elif probability > PRIORITY_THRESHOLDS[0]:
                     st.warning("""
                     **MEDIUM PRIORITY CLIENT**
                     - Standard marketing protocol
@@ -238,10 +516,39 @@ def main():
                     - Focus on relationship building
                     - Consider alternative products
                     """)
-                
+            
+    
+    with batch_tab:
+        st.subheader("📁 Batch Scoring")
+        st.markdown("Upload a CSV with the same columns as the training data (`;` or `,` separated).")
+
+        uploaded = st.file_uploader("Client CSV", type="csv")
+
+        if uploaded is not None:
+            model = load_model()
+
+            if model is None:
+                st.stop()
+
+            try:
+                results, results_csv = score_batch(model, uploaded.file_id, uploaded.getvalue())
+
+                skipped = int(results['probability'].isna().sum())
+                if skipped:
+                    st.warning(f"{skipped} row(s) with missing numeric values were not scored.")
+
+                st.dataframe(results)
+
+                st.download_button(
+                    "⬇️ Download Predictions",
+                    results_csv,
+                    file_name="bank_marketing_predictions.csv",
+                    mime="text/csv"
+                )
+
             except Exception as e:
-                st.error(f"Prediction error: {e}")
-                st.info("Please check that all required features are provided.")
+                st.error(f"Batch prediction error: {e}")
+                st.info("Please check that the file contains all required columns.")
     
     # Footer
     st.markdown("---")
@@ -252,6 +559,10 @@ def main():
         </div>
     """, unsafe_allow_html=True)
 
+    # Load and warm up the model only after the whole page has been sent, so the first
+    # render is not delayed and the first click finds it ready (later reruns hit the cache)
+    load_model()
+
 if __name__ == '__main__':
     main()
 